@@ -1,6 +1,11 @@
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from joblib import Parallel, delayed
+from numba import njit
+from numpy.random import Generator, SFC64
+from datetime import datetime
 
 # ============================================================
 # CONFIGURATION
@@ -12,9 +17,17 @@ NUM_STEPS = int(HOURS * 3600)
 RF_FREQ_HZ = 3e9
 
 OUTPUT_CSV = "ftc36h.csv"
+CSV_BATCH_SIZE = 65536
+
+# Telemetry columns are stored at single precision (noise is ~1%)
+STORAGE_DTYPE = np.float32
 
 RANDOM_SEED = 42
-rng = np.random.default_rng(RANDOM_SEED)
+# SFC64 has higher throughput than the default PCG64 bit generator
+rng = Generator(SFC64(RANDOM_SEED))
+
+# Worker threads for the trajectory loop (-1 = all cores)
+N_JOBS = -1
 
 # Trajectory targets (minimums)
 MIN_INCI = 8
@@ -25,12 +38,10 @@ MIN_TERM = 12
 # FAILURE MODE ASSIGNMENT
 # ============================================================
 
-FAILURE_MODES = (
-    ["normal"] * 40 +
-    ["incipient"] * MIN_INCI +
-    ["recovering"] * MIN_RECV +
-    ["terminal"] * MIN_TERM
-)
+FAILURE_MODE_LABELS = np.array(["normal", "incipient", "recovering", "terminal"])
+FAILURE_MODE_COUNTS = np.array([40, MIN_INCI, MIN_RECV, MIN_TERM])
+
+FAILURE_MODES = np.repeat(FAILURE_MODE_LABELS, FAILURE_MODE_COUNTS)
 
 rng.shuffle(FAILURE_MODES)
 
@@ -41,19 +52,36 @@ rng.shuffle(FAILURE_MODES)
 T_REF = 25.0
 V_SUPPLY = 28.0
 
-# FTC parameters
-FTC_TIMER_THRESHOLD = {
-    "terminal": 1200,     
-    "incipient": 300,
-    "recovering": 300
+# PA supply current
+I_IDLE = 0.5
+K_POWER = 0.15
+K_AGING = 2.0
+
+# PA temperature
+ALPHA = 0.02
+BETA = 0.01
+
+# RF output power / frequency error
+P_LINEAR_END = 10.0
+K_TEMP_COMP = 0.02
+K_AGING_COMP = 1.5
+K_EXT_TEMP_FREQ = 0.2
+
+# Integer failure mode codes (keeps the jitted kernel typed)
+FAILURE_MODE_CODES = {
+    "normal": 0,
+    "incipient": 1,
+    "recovering": 2,
+    "terminal": 3
 }
 
-FTC_AMP_CAP = {
-    "normal": 1.0,
-    "incipient": 1.25,
-    "recovering": 1.7,
-    "terminal": 3.0
-}
+MODE_NORMAL = 0
+MODE_TERMINAL = 3
+
+# FTC parameters, indexed by failure mode code
+# (normal never activates FTC, so its threshold is unused)
+FTC_TIMER_THRESHOLD = np.array([0, 300, 300, 1200], dtype=np.int32)
+FTC_AMP_CAP = np.array([1.0, 1.25, 1.7, 3.0])
 
 # Degradation parameters
 
@@ -65,10 +93,13 @@ FTC_THERMAL_GAIN = 0.04   # °C / step (terminal only)
 EPS_ACLR = 0.02           # dB / step
 EPS_EVM  = 0.02           # % / step
 
+EVM_SOFT_SCALE = 25.0
+
 # ============================================================
 # HELPER FUNCTIONS
 # ============================================================
 
+@njit
 def rf_power_schedule(t):
     if t < 8 * 3600:
         return 6.0
@@ -77,82 +108,112 @@ def rf_power_schedule(t):
     else:
         return 8.0
 
+@njit
 def rf_output_state(t):
-    return True if (t % 1800) < 1500 else False
-
-def ambient_temperature(t):
-    return 25 + 3 * np.sin(t / 7200) + rng.normal(0, 0.3)
+    return (t % 1800) < 1500
 
 # ============================================================
-# SIMULATION
+# TRAJECTORY KERNEL
 # ============================================================
 
-rows = []
-start_time = datetime.now()
-
-for traj_id, FAILURE_MODE in enumerate(FAILURE_MODES):
+# Per-step random draws, pre-generated and pre-scaled per trajectory:
+#   noise_buf[:, k] ~ N(0, NOISE_SIGMAS[k]) for k = ambient, current,
+#                     temperature, rf output, drift, int freq, ext freq,
+#                     aclr, evm
+#   unif_buf[:, k]  ~ U(UNIF_LOW[k], UNIF_HIGH[k]) for k = aclr
+#                     degradation, evm degradation
+# The ambient column is folded into the ambient temperature array before
+# the kernel runs; the kernel reads the remaining columns.
+# No random numbers are drawn inside the kernel. Parallelism is across
+# trajectories (see simulate_one), so the per-step loop stays serial
+# rather than using prange, which would oversubscribe the worker threads.
+NOISE_SIGMAS = np.array([0.3, 0.05, 0.1, 0.2, 0.05, 1.0, 0.5, 0.3, 0.08])
+UNIF_LOW = np.array([0.005, 0.01])
+UNIF_HIGH = np.array([0.015, 0.03])
+
+# Compiled code is cached to __pycache__, so only the first run pays
+# for codegen; argument dtypes are fixed to keep the cache key stable
+@njit(
+    fastmath=True,
+    cache=True,
+    nogil=True,
+    boundscheck=False,
+    error_model="numpy"
+)
+def simulate_trajectory(
+    num_steps,
+    failure_mode_code,
+    aclr_deg_rate,
+    evm_deg_rate,
+    ambient,
+    noise_buf,
+    unif_buf,
+    rf_power_out,
+    rf_on_out,
+    pa_current_out,
+    pa_temp_out,
+    measured_rf_out,
+    freq_error_int_out,
+    freq_error_ext_out,
+    aclr_out,
+    evm_out,
+    aging_out,
+    ftc_active_out,
+):
+    terminal = failure_mode_code == MODE_TERMINAL
+    ftc_thresh = FTC_TIMER_THRESHOLD[failure_mode_code]
+    ftc_cap = FTC_AMP_CAP[failure_mode_code]
 
     # Initial states
-    time_s = 0.0
-    aging_factor = 0.0
     pa_temp = T_REF
     freq_drift = 0.0
 
     prev_aclr = 45.0
     prev_evm = 1.0
 
-    # Degradation state variables 
+    # Degradation state variables
     aclr_deg_state = 0.0
     evm_deg_state  = 0.0
-    
-    if FAILURE_MODE == "terminal":
-        aclr_deg_rate = rng.uniform(0.8, 1.4)
-        evm_deg_rate  = rng.uniform(0.7, 1.5)
-    else:
-        aclr_deg_rate = 1.0
-        evm_deg_rate  = 1.0
-
 
     ftc_timer = 0
     ftc_active = False
     ftc_amp = 1.0
 
-    for step in range(NUM_STEPS):
-        time_s += DT
-        ts = start_time + timedelta(seconds=time_s)
+    # Single fused pass: every recurrence (temperature, FTC timer/amp,
+    # degradation states, drift, ACLR, EVM) advances as a scalar in the
+    # same iteration; only the output columns are written per step
+    for step in range(num_steps):
+        # Time and aging are linear in the step index, not recurrences
+        time_s = (step + 1) * DT
 
         # -------------------------------
         # STAGE 0 — EXOGENOUS
         # -------------------------------
-        aging_factor += 1e-7
-        ambient = ambient_temperature(time_s)
+        aging_factor = (step + 1) * 1e-7
         rf_power = rf_power_schedule(time_s)
         rf_on = rf_output_state(time_s)
 
         # -------------------------------
         # STAGE 1 — CURRENT
         # -------------------------------
-        if rf_on:
-            pa_current = (
-                0.5 +
-                0.15 * rf_power +
-                2.0 * aging_factor +
-                rng.normal(0, 0.05)
-            )
-        else:
-            pa_current = 0.0
+        pa_current = (
+            I_IDLE +
+            K_POWER * rf_power +
+            K_AGING * aging_factor +
+            noise_buf[step, 1]
+        ) if rf_on else 0.0
 
         # -------------------------------
         # STAGE 2 — TEMPERATURE
         # -------------------------------
         pa_temp += (
-            0.02 * (V_SUPPLY * pa_current - rf_power)
-            - 0.01 * (pa_temp - ambient)
-            + rng.normal(0, 0.1)
+            ALPHA * (V_SUPPLY * pa_current - rf_power)
+            - BETA * (pa_temp - ambient[step])
+            + noise_buf[step, 2]
         )
 
         # FTC thermal runaway (terminal only)
-        if FAILURE_MODE == "terminal" and ftc_active:
+        if terminal and ftc_active:
             pa_temp += FTC_THERMAL_GAIN * ftc_amp
 
         # -------------------------------
@@ -166,60 +227,54 @@ for traj_id, FAILURE_MODE in enumerate(FAILURE_MODES):
             ftc_timer = max(0, ftc_timer - 1)
 
         if (
-            FAILURE_MODE != "normal"
-            and ftc_timer >= FTC_TIMER_THRESHOLD[FAILURE_MODE]
+            failure_mode_code != MODE_NORMAL
+            and ftc_timer >= ftc_thresh
         ):
             ftc_active = True
 
-        # -------------------------------------------------
-        # TERMINAL DEGRADATION STATE EVOLUTION (NEW)
-        # -------------------------------------------------
-
-        if FAILURE_MODE == "terminal" and ftc_active:
-            # Slow, irreversible degradation accumulation
-            aclr_deg_state += rng.uniform(0.005, 0.015)
-            evm_deg_state  += rng.uniform(0.01, 0.03)
-
-
         if ftc_active:
-            ftc_amp = min(
-                ftc_amp + 0.001,
-                FTC_AMP_CAP[FAILURE_MODE]
-            )
+            ftc_amp = min(ftc_amp + 0.001, ftc_cap)
         else:
             ftc_amp = max(1.0, ftc_amp - 0.001)
 
-        
-            # DEGRADATION STATE EVOLUTION (NEW, REQUIRED)
-
-
-        if FAILURE_MODE == "terminal" and ftc_active:
-            aclr_deg_state += BASE_ACLR_DEG * ftc_amp * aclr_deg_rate
-            evm_deg_state  += BASE_EVM_DEG  * ftc_amp * evm_deg_rate
+        # -------------------------------------------------
+        # TERMINAL DEGRADATION STATE EVOLUTION
+        # -------------------------------------------------
 
+        if terminal and ftc_active:
+            # Slow, irreversible degradation accumulation: random
+            # per-step increment plus an FTC-amplified drift term
+            aclr_deg_state += (
+                unif_buf[step, 0]
+                + BASE_ACLR_DEG * ftc_amp * aclr_deg_rate
+            )
+            evm_deg_state  += (
+                unif_buf[step, 1]
+                + BASE_EVM_DEG  * ftc_amp * evm_deg_rate
+            )
 
         # -------------------------------
         # STAGE 3 — RF METRICS
         # -------------------------------
         compression = max(
-            0,
-            (rf_power - 10)
-            + 0.02 * max(0, pa_temp - T_REF)
-            + 1.5 * aging_factor
+            0.0,
+            (rf_power - P_LINEAR_END)
+            + K_TEMP_COMP * max(0.0, pa_temp - T_REF)
+            + K_AGING_COMP * aging_factor
         )
 
-        measured_rf = rf_power - compression + rng.normal(0, 0.2)
+        measured_rf = rf_power - compression + noise_buf[step, 3]
 
-        freq_drift += rng.normal(0, 0.05)
+        freq_drift += noise_buf[step, 4]
         freq_error_int = (
             (pa_temp - T_REF)
             + freq_drift
-            + rng.normal(0, 1.0)
+            + noise_buf[step, 5]
         )
 
         freq_error_ext = (
-            0.2 * (pa_temp - T_REF)
-            + rng.normal(0, 0.5)
+            K_EXT_TEMP_FREQ * (pa_temp - T_REF)
+            + noise_buf[step, 6]
         )
 
         # # -------------------------------
@@ -246,20 +301,19 @@ for traj_id, FAILURE_MODE in enumerate(FAILURE_MODES):
         # Base physical ACLR response
         aclr_physical = (
             prev_aclr
-            - 0.06 * max(0, rf_power - 5)
-            - 0.04 * max(0, pa_temp - 40)
-            + rng.normal(0, 0.3)
+            - 0.06 * max(0.0, rf_power - 5)
+            - 0.04 * max(0.0, pa_temp - 40)
+            + noise_buf[step, 7]
         )
 
         # Terminal degradation bias (NEW)
-        if FAILURE_MODE == "terminal" and ftc_active:
+        if terminal and ftc_active:
             aclr = aclr_physical - aclr_deg_state
         else:
             aclr = aclr_physical
 
         # Soft bounding only
-        aclr = min(aclr, 100)
-
+        aclr = aclr if aclr < 100.0 else 100.0
 
         # -------------------------------
         # STAGE 5 — EVM
@@ -289,8 +343,8 @@ for traj_id, FAILURE_MODE in enumerate(FAILURE_MODES):
 
         # Base physical contribution 
         evm_physical = (
-            0.12 * max(0, 45 - aclr)
-            + 0.03 * max(0, pa_temp - 40)
+            0.12 * max(0.0, 45 - aclr)
+            + 0.03 * max(0.0, pa_temp - 40)
             + 0.4 * aging_factor
         )
 
@@ -298,46 +352,165 @@ for traj_id, FAILURE_MODE in enumerate(FAILURE_MODES):
         evm_increment = evm_physical + evm_deg_state
 
         # Asymptotic slowdown 
-        EVM_SOFT_SCALE = 25.0   
         asymptotic_factor = 1.0 / (1.0 + prev_evm / EVM_SOFT_SCALE)
 
         # Increment smoothly
         evm = prev_evm + evm_increment * asymptotic_factor
 
         # Noise s
-        evm += rng.normal(0, 0.08)
+        evm += noise_buf[step, 8]
 
         # Terminal FTC guarantees directionality (NO PINNING)
-        if FAILURE_MODE == "terminal" and ftc_active:
-            evm = max(evm, prev_evm)
+        if terminal and ftc_active:
+            evm = evm if evm > prev_evm else prev_evm
 
         prev_aclr = aclr
         prev_evm = evm
 
-       
-        rows.append({
-            "ts": ts,
-            "rf_frequency_setpoint_hz": RF_FREQ_HZ,
-            "trajectory_id": traj_id,
-            "failure_mode": FAILURE_MODE,
-            "rf_power_setpoint_dbm": rf_power,
-            "rf_output_state": rf_on,
-            "pa_supply_current_a": pa_current,
-            "pa_temperature_c": pa_temp,
-            "measured_rf_output_dbm": measured_rf,
-            "freq_error_internal_hz": freq_error_int,
-            "freq_error_external_hz": freq_error_ext,
-            "aclr_db": aclr,
-            "rms_evm_percent": evm,
-            "aging_factor": aging_factor,
-            "ftc_active": ftc_active,
-            "data_source": "synthetic_physics"
-        })
-
-
-
-df = pd.DataFrame(rows)
-df.to_csv(OUTPUT_CSV, index=False)
+        rf_power_out[step] = rf_power
+        rf_on_out[step] = rf_on
+        pa_current_out[step] = pa_current
+        pa_temp_out[step] = pa_temp
+        measured_rf_out[step] = measured_rf
+        freq_error_int_out[step] = freq_error_int
+        freq_error_ext_out[step] = freq_error_ext
+        aclr_out[step] = aclr
+        evm_out[step] = evm
+        aging_out[step] = aging_factor
+        ftc_active_out[step] = ftc_active
+
+
+# ============================================================
+# SIMULATION
+# ============================================================
+
+NUM_TRAJ = len(FAILURE_MODES)
+N = NUM_TRAJ * NUM_STEPS
+
+# Encode failure modes once; everything downstream compares int codes
+FAILURE_MODE_CODE_ARR = np.array(
+    [FAILURE_MODE_CODES[m] for m in FAILURE_MODES], dtype=np.int8
+)
+
+# Preallocated output columns, one slice of NUM_STEPS per trajectory
+rf_power_arr = np.empty(N, dtype=STORAGE_DTYPE)
+rf_on_arr = np.empty(N, dtype=bool)
+pa_current_arr = np.empty(N, dtype=STORAGE_DTYPE)
+pa_temp_arr = np.empty(N, dtype=STORAGE_DTYPE)
+measured_rf_arr = np.empty(N, dtype=STORAGE_DTYPE)
+freq_error_int_arr = np.empty(N, dtype=STORAGE_DTYPE)
+freq_error_ext_arr = np.empty(N, dtype=STORAGE_DTYPE)
+aclr_arr = np.empty(N, dtype=STORAGE_DTYPE)
+evm_arr = np.empty(N, dtype=STORAGE_DTYPE)
+aging_arr = np.empty(N, dtype=STORAGE_DTYPE)
+ftc_active_arr = np.empty(N, dtype=bool)
+
+start_time = datetime.now()
+time_s = np.arange(1, NUM_STEPS + 1) * DT
+
+# Timestamps restart for every trajectory: build one trajectory's worth
+# with date_range and tile it when assembling the frame
+step_td = pd.Timedelta(seconds=DT)
+ts = pd.date_range(start_time + step_td, periods=NUM_STEPS, freq=step_td)
+
+# Deterministic ambient drift, shared by every trajectory
+ambient_base = 25 + 3 * np.sin(time_s / 7200)
+
+def simulate_one(traj_id, mode, seed):
+    # Independent stream per trajectory, so results do not depend on
+    # the order in which workers pick up trajectories
+    traj_rng = Generator(SFC64(seed))
+
+    if mode == MODE_TERMINAL:
+        aclr_deg_rate = traj_rng.uniform(0.8, 1.4)
+        evm_deg_rate  = traj_rng.uniform(0.7, 1.5)
+    else:
+        aclr_deg_rate = 1.0
+        evm_deg_rate  = 1.0
+
+    # One bulk draw per distribution instead of per-step scalar calls
+    noise_buf = traj_rng.standard_normal((NUM_STEPS, NOISE_SIGMAS.size)) * NOISE_SIGMAS
+    unif_buf = traj_rng.uniform(UNIF_LOW, UNIF_HIGH, (NUM_STEPS, UNIF_LOW.size))
+    ambient = ambient_base + noise_buf[:, 0]
+
+    k = slice(traj_id * NUM_STEPS, (traj_id + 1) * NUM_STEPS)
+
+    # Trajectories write disjoint slices, so no locking is needed
+    simulate_trajectory(
+        NUM_STEPS,
+        mode,
+        aclr_deg_rate,
+        evm_deg_rate,
+        ambient,
+        noise_buf,
+        unif_buf,
+        rf_power_arr[k],
+        rf_on_arr[k],
+        pa_current_arr[k],
+        pa_temp_arr[k],
+        measured_rf_arr[k],
+        freq_error_int_arr[k],
+        freq_error_ext_arr[k],
+        aclr_arr[k],
+        evm_arr[k],
+        aging_arr[k],
+        ftc_active_arr[k],
+    )
+
+
+# The kernel releases the GIL, so threads run trajectories concurrently
+# without pickling the shared output arrays
+seeds = np.random.SeedSequence(RANDOM_SEED).spawn(NUM_TRAJ)
+
+Parallel(n_jobs=N_JOBS, prefer="threads")(
+    delayed(simulate_one)(traj_id, int(mode), seed)
+    for (traj_id, mode), seed in zip(enumerate(FAILURE_MODE_CODE_ARR), seeds)
+)
+
+
+df = pd.DataFrame({
+    "ts": np.tile(ts.values, NUM_TRAJ),
+    "rf_frequency_setpoint_hz": RF_FREQ_HZ,
+    "trajectory_id": np.repeat(np.arange(NUM_TRAJ), NUM_STEPS),
+    "failure_mode": pd.Categorical.from_codes(
+        np.repeat(FAILURE_MODE_CODE_ARR, NUM_STEPS),
+        categories=FAILURE_MODE_LABELS
+    ),
+    "rf_power_setpoint_dbm": rf_power_arr,
+    "rf_output_state": rf_on_arr,
+    "pa_supply_current_a": pa_current_arr,
+    "pa_temperature_c": pa_temp_arr,
+    "measured_rf_output_dbm": measured_rf_arr,
+    "freq_error_internal_hz": freq_error_int_arr,
+    "freq_error_external_hz": freq_error_ext_arr,
+    "aclr_db": aclr_arr,
+    "rms_evm_percent": evm_arr,
+    "aging_factor": aging_arr,
+    "ftc_active": ftc_active_arr,
+    "data_source": pd.Categorical.from_codes(
+        np.zeros(N, dtype=np.int8),
+        categories=["synthetic_physics"]
+    )
+})
+
+# Multithreaded C++ CSV serialization, written in record batches.
+# Rows are unquoted to stay close to pandas' dialect (pyarrow always
+# quotes its own header, so the header line is written here). Booleans
+# are written as true/false and whole-number floats without ".0", so
+# pd.read_csv infers rf_power_setpoint_dbm and rf_frequency_setpoint_hz
+# as int64
+table = pa.Table.from_pandas(df, preserve_index=False)
+with open(OUTPUT_CSV, "wb") as f:
+    f.write((",".join(table.column_names) + "\n").encode())
+    pacsv.write_csv(
+        table,
+        f,
+        write_options=pacsv.WriteOptions(
+            include_header=False,
+            batch_size=CSV_BATCH_SIZE,
+            quoting_style="none"
+        )
+    )
 
 print("36h FTC dataset generated")
 print(df["failure_mode"].value_counts())